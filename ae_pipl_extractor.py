@@ -2,10 +2,13 @@
 """AE PIPL Extractor - Extract and decompile Adobe After Effects PIPL resources."""
 
 import argparse
+import contextlib
+import io
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from resource_fork_parser import ResourceForkParser
 from rcp_parser import RcpParser
@@ -13,6 +16,14 @@ from r_generator import RGenerator
 from pipl_types import PiplProperty
 from aex_resource_extractor import AexResourceExtractor
 
+# File extensions that identify the input type directly
+_EXTENSION_TYPES = {
+    '.rsrc': 'rsrc',
+    '.rcp': 'rcp',
+    '.aex': 'aex',
+    '.plugin': 'plugin'
+}
+
 def detect_file_type(file_path: str) -> Optional[str]:
     """Detect the type of input file based on extension and content."""
     path = Path(file_path)
@@ -20,17 +31,10 @@ def detect_file_type(file_path: str) -> Optional[str]:
     if not path.exists():
         return None
 
-    extension = path.suffix.lower()
-
     # Direct file type detection
-    if extension == '.rsrc':
-        return 'rsrc'
-    elif extension == '.rcp':
-        return 'rcp'
-    elif extension == '.aex':
-        return 'aex'
-    elif extension == '.plugin':
-        return 'plugin'
+    file_type = _EXTENSION_TYPES.get(path.suffix.lower())
+    if file_type:
+        return file_type
 
     # Check if it's a directory (plugin bundle)
     if path.is_dir() and path.name.endswith('.plugin'):
@@ -41,16 +45,16 @@ def detect_file_type(file_path: str) -> Optional[str]:
         with open(file_path, 'rb') as f:
             header = f.read(1024)
 
-        # Check for RCP text format
-        if b'PiPL' in header and b'BEGIN' in header:
-            return 'rcp'
-
         # Check for PE executable (AEX)
         if header[:2] == b'MZ':
             return 'aex'
 
+        # Check for RCP text format
+        if b'PiPL' in header and b'BEGIN' in header:
+            return 'rcp'
+
         # Check for resource fork binary format
-        if b'8BIM' in header or len(header) > 256:
+        if len(header) > 256 or b'8BIM' in header:
             return 'rsrc'
 
     except Exception:
@@ -109,8 +113,9 @@ def parse_file(file_path: str, file_type: str) -> List[PiplProperty]:
 
     elif file_type == 'aex':
         try:
-            extractor = AexResourceExtractor(file_path)
-            properties = extractor.extract_pipl_properties()
+            with AexResourceExtractor(file_path, verbose=True) as extractor:
+                properties = extractor.extract_pipl_properties()
+                extractor.flush_log()
 
             if not properties:
                 print(f"Warning: No PIPL properties found in {file_path}")
@@ -140,6 +145,73 @@ def parse_file(file_path: str, file_type: str) -> List[PiplProperty]:
 
     return properties
 
+def find_batch_inputs(directory: str) -> List[Tuple[str, str]]:
+    """List the plug-ins and resources in a directory as (path, file_type) pairs."""
+    inputs = []
+
+    # Only trust extensions here, content sniffing would pick up unrelated files
+    for path in sorted(Path(directory).iterdir()):
+        file_type = _EXTENSION_TYPES.get(path.suffix.lower())
+        if file_type:
+            inputs.append((str(path), file_type))
+
+    return inputs
+
+def _parse_batch_input(batch_input: Tuple[str, str]) -> Tuple[str, List[PiplProperty]]:
+    """Parse one batch input in a worker process, capturing what the parsers print."""
+    file_path, file_type = batch_input
+    log = io.StringIO()
+
+    with contextlib.redirect_stdout(log):
+        properties = parse_file(file_path, file_type)
+
+    return log.getvalue(), properties
+
+def parse_batch(directory: str, jobs: Optional[int] = None) -> int:
+    """Parse every input in a directory in parallel and print the results in order.
+
+    Returns the number of inputs that yielded PIPL properties.
+    """
+    batch_inputs = find_batch_inputs(directory)
+    if not batch_inputs:
+        print(f"No .rsrc, .rcp, .aex or .plugin inputs found in '{directory}'.")
+        return 0
+
+    workers = jobs or os.cpu_count() or 1
+    chunksize = max(1, len(batch_inputs) // (4 * workers))
+    found = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_parse_batch_input, batch_inputs, chunksize=chunksize)
+
+        for (file_path, file_type), (log, properties) in zip(batch_inputs, results):
+            print("=" * 80)
+            print(f"Detected file type: {file_type}")
+            print(f"Parsing {file_path}...")
+            sys.stdout.write(log)
+
+            if not properties:
+                print("No PIPL properties found.")
+                continue
+
+            found += 1
+            print(f"Found {len(properties)} PIPL properties: ")
+            RGenerator(properties).print_info()
+
+    return found
+
+def _job_count(value: str) -> int:
+    """argparse type for --jobs: a worker count, where 0 means the CPU count."""
+    try:
+        jobs = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+
+    if jobs < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 (CPU count) or a positive number, got {jobs}")
+
+    return jobs
+
 def main():
     parser = argparse.ArgumentParser(
         description="Extract and decompile Adobe After Effects PIPL resources",
@@ -151,12 +223,13 @@ Examples:
   %(prog)s plugin.aex -o plugin.r               # Extract from Windows .aex file
   %(prog)s plugin.plugin -o plugin.r            # Extract from macOS .plugin bundle
   %(prog)s plugin.rsrc --info                   # Show plugin information only
+  %(prog)s --batch plugins/                     # Extract from every plug-in in a directory
         """
     )
 
     parser.add_argument(
         'input_file',
-        help='Input file (.rsrc, .rcp, .aex, or .plugin bundle)'
+        help='Input file (.rsrc, .rcp, .aex, or .plugin bundle), or a directory with --batch'
     )
 
     parser.add_argument(
@@ -165,8 +238,37 @@ Examples:
         help='Force file type detection (rsrc, rcp, aex, or plugin)'
     )
 
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='Treat input_file as a directory and parse every .rsrc, .rcp, .aex '
+             'and .plugin entry in it in parallel (types come from extensions)'
+    )
+
+    parser.add_argument(
+        '--jobs',
+        type=_job_count,
+        help='Number of worker processes for --batch (default or 0: CPU count)'
+    )
+
     args = parser.parse_args()
 
+    if args.batch and args.force_type:
+        parser.error('--force-type cannot be used with --batch (batch types come from extensions)')
+
+    if args.jobs is not None and not args.batch:
+        parser.error('--jobs only applies to --batch')
+
+    if args.batch:
+        if not os.path.isdir(args.input_file):
+            print(f"Error: Batch input '{args.input_file}' is not a directory.")
+            sys.exit(1)
+
+        if not parse_batch(args.input_file, args.jobs):
+            print("No PIPL properties found. Exiting.")
+            sys.exit(1)
+        return
+
     # Check input file
     if not os.path.exists(args.input_file):
         print(f"Error: Input file '{args.input_file}' not found.")
@@ -1,9 +1,23 @@
 #!/usr/bin/env python3
 """Analyzer for Windows .aex files to extract PIPL resources."""
 
+import mmap
+import re
 import struct
 import sys
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Iterator, Optional, Tuple
+
+# IMAGE_SECTION_HEADER: name, virtual size/address, raw size/offset,
+# relocation/line-number pointers and counts, characteristics (40 bytes)
+_SECTION_HEADER = struct.Struct('<8sIIIIIIHHI')
+
+_U32_LE = struct.Struct('<I')
+_U32_BE = struct.Struct('>I')
+_U16_LE = struct.Struct('<H')
+_U16_BE = struct.Struct('>H')
+
+# First non-padding byte after an 8BIM type code
+_NONZERO = re.compile(rb'[^\x00]')
 
 class AexAnalyzer:
     """Analyze Windows .aex files (PE format) to extract PIPL resources."""
@@ -11,27 +25,54 @@ class AexAnalyzer:
     def __init__(self, file_path: str):
         self.file_path = file_path
         self.data = b''
+        self._mmap = None
         self.pe_header_offset = 0
         self.resource_table_offset = 0
+        self._pe_valid = None
+        self._sections = None
         self._load_file()
 
     def _load_file(self) -> None:
-        """Load the entire AEX file into memory."""
+        """Map the AEX file into memory (read-only)."""
         try:
             with open(self.file_path, 'rb') as f:
-                self.data = f.read()
+                # mmap cannot map an empty file, keep b'' in that case
+                if f.seek(0, 2) > 0:
+                    self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    self.data = self._mmap
+
+                    # Scans run front to back, let the kernel read ahead aggressively
+                    if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                        self._mmap.madvise(mmap.MADV_SEQUENTIAL)
         except Exception as e:
             raise Exception(f"Error loading AEX file: {e}")
 
+    def close(self) -> None:
+        """Release the memory mapping of the AEX file.
+
+        Views returned by extract_potential_rcp_data must be released first.
+        """
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+            self.data = b''
+
+    def __del__(self):
+        try:
+            self.close()
+        except BufferError:
+            # A view is still alive; it keeps the mapping referenced until it goes away
+            pass
+
     def _read_uint32(self, offset: int, little_endian: bool = True) -> int:
         """Read a 32-bit unsigned integer."""
         if offset + 4 > len(self.data):
             raise ValueError(f"Cannot read uint32 at offset {offset}")
 
         if little_endian:
-            return struct.unpack('<I', self.data[offset:offset+4])[0]
+            return _U32_LE.unpack_from(self.data, offset)[0]
         else:
-            return struct.unpack('>I', self.data[offset:offset+4])[0]
+            return _U32_BE.unpack_from(self.data, offset)[0]
 
     def _read_uint16(self, offset: int, little_endian: bool = True) -> int:
         """Read a 16-bit unsigned integer."""
@@ -39,12 +80,18 @@ class AexAnalyzer:
             raise ValueError(f"Cannot read uint16 at offset {offset}")
 
         if little_endian:
-            return struct.unpack('<H', self.data[offset:offset+2])[0]
+            return _U16_LE.unpack_from(self.data, offset)[0]
         else:
-            return struct.unpack('>H', self.data[offset:offset+2])[0]
+            return _U16_BE.unpack_from(self.data, offset)[0]
 
     def _find_pe_header(self) -> bool:
-        """Find the PE header in the file."""
+        """Find the PE header in the file (result is cached)."""
+        if self._pe_valid is None:
+            self._pe_valid = self._locate_pe_header()
+        return self._pe_valid
+
+    def _locate_pe_header(self) -> bool:
+        """Locate and verify the PE header in the file."""
         # Check for DOS header
         if len(self.data) < 64:
             return False
@@ -62,12 +109,10 @@ class AexAnalyzer:
 
         return False
 
-    def _parse_pe_sections(self) -> List[Dict]:
-        """Parse PE section headers."""
-        sections = []
-
+    def _iter_sections(self) -> Iterator[Dict]:
+        """Parse PE section headers lazily, one section at a time."""
         if not self._find_pe_header():
-            return sections
+            return
 
         # Skip PE signature (4 bytes) and COFF header (20 bytes)
         optional_header_offset = self.pe_header_offset + 24
@@ -81,34 +126,34 @@ class AexAnalyzer:
         # Section headers start after optional header
         section_headers_offset = optional_header_offset + optional_header_size
 
-        for i in range(num_sections):
-            section_offset = section_headers_offset + (i * 40)  # Each section header is 40 bytes
+        # Only parse the headers that fit entirely inside the file
+        available = max(0, (len(self.data) - section_headers_offset) // _SECTION_HEADER.size)
+        headers_end = section_headers_offset + min(num_sections, available) * _SECTION_HEADER.size
 
-            if section_offset + 40 > len(self.data):
-                break
+        # Copy the (small) header table so that no buffer export outlives an
+        # abandoned generator and blocks closing the memory map
+        for fields in _SECTION_HEADER.iter_unpack(self.data[section_headers_offset:headers_end]):
+            name_bytes, virtual_size, virtual_address, raw_size, raw_offset = fields[:5]
 
-            # Read section name (8 bytes)
-            name = self.data[section_offset:section_offset+8].rstrip(b'\x00').decode('ascii', errors='ignore')
-
-            # Read section info
-            virtual_size = self._read_uint32(section_offset + 8)
-            virtual_address = self._read_uint32(section_offset + 12)
-            raw_size = self._read_uint32(section_offset + 16)
-            raw_offset = self._read_uint32(section_offset + 20)
-
-            sections.append({
-                'name': name,
+            yield {
+                'name': name_bytes.rstrip(b'\x00').decode('ascii', errors='ignore'),
                 'virtual_size': virtual_size,
                 'virtual_address': virtual_address,
                 'raw_size': raw_size,
                 'raw_offset': raw_offset
-            })
+            }
 
-        return sections
+    def _parse_pe_sections(self) -> List[Dict]:
+        """Parse all PE section headers (result is cached)."""
+        if self._sections is None:
+            self._sections = list(self._iter_sections())
+        return self._sections
 
     def _find_resource_section(self) -> Optional[Dict]:
         """Find the .rsrc section containing resources."""
-        sections = self._parse_pe_sections()
+        # Reuse the full section list if it was already parsed, otherwise stop
+        # parsing headers as soon as .rsrc turns up
+        sections = self._sections if self._sections is not None else self._iter_sections()
 
         for section in sections:
             if section['name'] == '.rsrc':
@@ -116,81 +161,62 @@ class AexAnalyzer:
 
         return None
 
-    def _search_for_pipl_data(self) -> List[Dict]:
-        """Search for PIPL data in the entire file."""
-        pipl_blocks = []
-        offset = 0
-
-        # Look for PiPL resource markers
-        while offset < len(self.data) - 16:
-            # Look for resource type "PiPL"
-            if self.data[offset:offset+4] == b'PiPL':
+    def _search_for_pipl_data(self, start: int = 0, end: Optional[int] = None) -> List[int]:
+        """Search data[start:end] (whole file by default) for PiPL marker offsets."""
+        pipl_offsets = []
+        limit = len(self.data) - 16
+        if end is None or end > len(self.data):
+            end = len(self.data)
+
+        # Look for resource type "PiPL" and its reversed form "LPiP",
+        # always taking whichever marker comes first
+        next_pipl = self.data.find(b'PiPL', start, end)
+        next_lpip = self.data.find(b'LPiP', start, end)
+
+        while next_pipl >= 0 or next_lpip >= 0:
+            if next_lpip < 0 or (0 <= next_pipl < next_lpip):
+                offset = next_pipl
+                if offset >= limit:
+                    break
                 print(f"Found 'PiPL' at offset 0x{offset:08x}")
-
-                # Try to extract some data around it
-                start = max(0, offset - 32)
-                end = min(len(self.data), offset + 512)
-                context = self.data[start:end]
-
-                pipl_blocks.append({
-                    'offset': offset,
-                    'context_start': start,
-                    'context_data': context
-                })
-
-            # Also look for reversed "LPiP"
-            elif self.data[offset:offset+4] == b'LPiP':
+                next_pipl = self.data.find(b'PiPL', offset + 1, end)
+            else:
+                offset = next_lpip
+                if offset >= limit:
+                    break
                 print(f"Found 'LPiP' (reversed) at offset 0x{offset:08x}")
+                next_lpip = self.data.find(b'LPiP', offset + 1, end)
 
-                start = max(0, offset - 32)
-                end = min(len(self.data), offset + 512)
-                context = self.data[start:end]
-
-                pipl_blocks.append({
-                    'offset': offset,
-                    'context_start': start,
-                    'context_data': context
-                })
+            pipl_offsets.append(offset)
 
-            offset += 1
-
-        return pipl_blocks
+        return pipl_offsets
 
     def _search_for_8bim_signatures(self) -> List[Dict]:
         """Search for 8BIM signatures that might contain PIPL data."""
         bim_blocks = []
-        offset = 0
-
-        while offset < len(self.data) - 16:
-            if self.data[offset:offset+4] == b'8BIM':
-                # Get property type and length
-                prop_type = self.data[offset+4:offset+8]
-
-                try:
-                    # Skip padding and read length
-                    length_offset = offset + 8
-                    while (length_offset < len(self.data) and
-                           self.data[length_offset] == 0):
-                        length_offset += 1
-
-                    if length_offset + 4 <= len(self.data):
-                        length = self._read_uint32(length_offset, little_endian=False)  # Big-endian for 8BIM
-
-                        if length < 10000:  # Reasonable length
-                            data_start = length_offset + 4
-                            if data_start + length <= len(self.data):
-                                prop_data = self.data[data_start:data_start + length]
-
-                                bim_blocks.append({
-                                    'offset': offset,
-                                    'type': prop_type,
-                                    'length': length,
-                                    'data': prop_data
-                                })
-                except:
-                    pass
-
-            offset += 1
+        data = self.data
+        data_len = len(data)
+        offset = data.find(b'8BIM')
+
+        while 0 <= offset < data_len - 16:
+            # Skip padding and read length
+            match = _NONZERO.search(data, offset + 8)
+            length_offset = match.start() if match else data_len
+
+            if length_offset + 4 <= data_len:
+                # Bounds are checked above, so read the big-endian length directly
+                length = _U32_BE.unpack_from(data, length_offset)[0]
+                data_start = length_offset + 4
+
+                if length < 10000 and data_start + length <= data_len:  # Reasonable length
+                    bim_blocks.append({
+                        'offset': offset,
+                        'type': data[offset+4:offset+8],
+                        'length': length,
+                        'data': data[data_start:data_start + length]
+                    })
+
+            offset = data.find(b'8BIM', offset + 1)
 
         return bim_blocks
 
@@ -213,14 +239,19 @@ class AexAnalyzer:
             results['sections'] = self._parse_pe_sections()
             results['resource_section'] = self._find_resource_section()
 
-        # Search for PIPL data
-        results['pipl_blocks'] = self._search_for_pipl_data()
+        # Search for PIPL data, limited to the resource section when there is one
+        rsrc = results['resource_section']
+        if rsrc:
+            results['pipl_blocks'] = self._search_for_pipl_data(
+                rsrc['raw_offset'], rsrc['raw_offset'] + rsrc['raw_size'])
+        else:
+            results['pipl_blocks'] = self._search_for_pipl_data()
         results['bim_blocks'] = self._search_for_8bim_signatures()
 
         return results
 
-    def extract_potential_rcp_data(self) -> Optional[bytes]:
-        """Try to extract data that looks like RCP content."""
+    def extract_potential_rcp_data(self) -> Optional[memoryview]:
+        """Try to extract data that looks like RCP content (as a zero-copy view)."""
         # Look for resource data that might contain the compiled RCP
         resource_section = self._find_resource_section()
 
@@ -229,7 +260,7 @@ class AexAnalyzer:
             end = start + resource_section['raw_size']
 
             if end <= len(self.data):
-                return self.data[start:end]
+                return memoryview(self.data)[start:end]
 
         return None
 
@@ -260,8 +291,8 @@ def analyze_aex_file(file_path: str):
 
         if results['pipl_blocks']:
             print(f"\nPiPL markers found: {len(results['pipl_blocks'])}")
-            for i, block in enumerate(results['pipl_blocks']):
-                print(f"  [{i+1}] Offset: 0x{block['offset']:08x}")
+            for i, offset in enumerate(results['pipl_blocks']):
+                print(f"  [{i+1}] Offset: 0x{offset:08x}")
 
         if results['bim_blocks']:
             print(f"\n8BIM blocks found: {len(results['bim_blocks'])}")
@@ -284,6 +315,7 @@ def analyze_aex_file(file_path: str):
         resource_data = analyzer.extract_potential_rcp_data()
         if resource_data:
             print(f"\nResource section data: {len(resource_data):,} bytes")
+            resource_data = resource_data.tobytes()
 
             # Look for text patterns that might indicate RCP content
             if b'PiPL' in resource_data:
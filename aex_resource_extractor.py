@@ -6,68 +6,114 @@ properties from a Windows `.aex` plugin's resource section. Standalone CLI
 and extra analysis utilities were removed to keep the repository minimal.
 """
 
+import re
 import struct
+import sys
 from aex_analyzer import AexAnalyzer
-from pipl_types import PiplProperty
+from pipl_types import PiplProperty, PIPL_PROPERTY_TYPES
+
+# Literal pattern: re searches memoryviews as fast as bytes.find searches bytes
+_MIB8 = re.compile(b'MIB8')
+
+_U32_LE = struct.Struct('<I')
+_U32_BE = struct.Struct('>I')
+_HH_LE = struct.Struct('<HH')
+_HH_BE = struct.Struct('>HH')
+
+# Known AEX (byte-reversed) type codes mapped straight to the canonical 4CC string
+_REVERSED_TYPES = {code[::-1]: code.decode('ascii') for code in PIPL_PROPERTY_TYPES}
+
+def _find_mib8(data, start: int = 0, end: int = sys.maxsize) -> int:
+    """Return the offset of the first MIB8 in data[start:end], or -1 (works on memoryviews)."""
+    match = _MIB8.search(data, start, end)
+    return match.start() if match else -1
 
 class AexResourceExtractor:
     """Extract PIPL data from AEX resource section."""
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, verbose: bool = False):
         self.analyzer = AexAnalyzer(file_path)
         self.resource_data = None
+        self.verbose = verbose
+        self._log = []
         self._load_resources()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def _load_resources(self):
-        """Load resource section data."""
+        """Load resource section data (a view into the memory-mapped file)."""
         self.resource_data = self.analyzer.extract_potential_rcp_data()
 
+    def _log_message(self, message: str):
+        """Buffer a progress message (verbose mode only) until flush_log is called."""
+        if self.verbose:
+            self._log.append(message)
+
+    def flush_log(self):
+        """Print the buffered progress messages in one write and clear them."""
+        if self._log:
+            print('\n'.join(self._log))
+            self._log.clear()
+
+    def close(self):
+        """Release the resource section view and unmap the AEX file."""
+        try:
+            if self.resource_data is not None:
+                self.resource_data.release()
+                self.resource_data = None
+            self.analyzer.close()
+        except BufferError:
+            # A view is still alive (e.g. held by a traceback's frames); it keeps
+            # the mapping referenced until it goes away. Raising here would also
+            # replace whatever exception made __exit__ run
+            pass
+
     def _find_pipl_data_in_resources(self):
         """Find PIPL data in the resource section."""
         if not self.resource_data:
             return None
 
-        # Look for MIB8 sequences which indicate PIPL data
-        offset = 0
-        pipl_start = None
+        # Find the start of PIPL data (the first MIB8 sequence),
+        # ignoring a signature that would end exactly at the end of the section
+        pipl_start = _find_mib8(self.resource_data, 0, len(self.resource_data) - 1)
 
-        # Find the start of PIPL data (look for the first MIB8)
-        while offset < len(self.resource_data) - 4:
-            if self.resource_data[offset:offset+4] == b'MIB8':
-                pipl_start = offset
-                break
-            offset += 1
-
-        if pipl_start is None:
+        if pipl_start < 0:
             return None
 
-        # Extract PIPL data from MIB8 start to end of section
-        return self.resource_data[pipl_start:]
+        # View (not copy) the PIPL data from MIB8 start to end of section
+        return memoryview(self.resource_data)[pipl_start:]
 
-    def _normalize_aex_property(self, prop_type_bytes: bytes, prop_data: bytes) -> tuple[str, bytes]:
+    def _normalize_aex_property(self, prop_type_bytes: bytes, prop_data: memoryview) -> tuple[str, bytes]:
         """Normalize AEX property type (reverse 4CC) and convert little-endian values to big-endian bytes.
         This ensures downstream decoders (expecting big-endian like .rcp/.rsrc) behave consistently.
+        The property data may be a view into the resource section; the returned data is always bytes.
         """
-        # Reverse 4CC like b'RVPe' -> 'ePVR'
-        try:
-            corrected_type = prop_type_bytes[::-1].decode('ascii', errors='ignore')
-        except Exception:
-            corrected_type = prop_type_bytes[::-1].hex()
+        # Reverse 4CC like b'RVPe' -> 'ePVR' (known codes need no reversal or decoding)
+        corrected_type = _REVERSED_TYPES.get(prop_type_bytes)
+        if corrected_type is None:
+            try:
+                corrected_type = prop_type_bytes[::-1].decode('ascii', errors='ignore')
+            except Exception:
+                corrected_type = prop_type_bytes[::-1].hex()
 
         # For known numeric properties, convert little-endian to big-endian byte order
         if corrected_type in ('ePVR', 'eSVR'):
             # Two 16-bit values in little-endian → repack as big-endian
             if len(prop_data) >= 4:
-                major_le, minor_le = struct.unpack('<HH', prop_data[:4])
-                prop_data = struct.pack('>HH', major_le, minor_le)
+                major_le, minor_le = _HH_LE.unpack_from(prop_data)
+                prop_data = _HH_BE.pack(major_le, minor_le)
         elif corrected_type in ('eVER', 'eINF', 'eGLO', 'eGL2', 'aeFL'):
             # Single 32-bit value little-endian → big-endian
             if len(prop_data) >= 4:
-                value_le = struct.unpack('<I', prop_data[:4])[0]
-                prop_data = struct.pack('>I', value_le)
+                value_le = _U32_LE.unpack_from(prop_data)[0]
+                prop_data = _U32_BE.pack(value_le)
         # Other types (strings/entry points) are left as-is
 
-        return corrected_type, prop_data
+        return corrected_type, bytes(prop_data)
 
     def extract_pipl_properties(self):
         """Extract PIPL properties from the resource section."""
@@ -76,58 +122,54 @@ class AexResourceExtractor:
             return []
 
         properties = []
-        offset = 0
-
-        print(f"Analyzing {len(pipl_data)} bytes of PIPL data...")
-
-        while offset < len(pipl_data) - 12:
-            # Look for MIB8 signature
-            if pipl_data[offset:offset+4] == b'MIB8':
-                try:
-                    # Read property type (4 bytes after MIB8)
-                    prop_type = pipl_data[offset+4:offset+8]
-
-                    # Skip null padding (usually 4 bytes)
-                    length_offset = offset + 8
-                    while (length_offset < len(pipl_data) and
-                           length_offset < offset + 16 and
-                           pipl_data[length_offset] == 0):
-                        length_offset += 1
-
-                    # Read length (little-endian for Windows resources)
-                    if length_offset + 4 <= len(pipl_data):
-                        length = struct.unpack('<I', pipl_data[length_offset:length_offset+4])[0]
-
-                        # Validate length
-                        if length > 0 and length < 10000:
-                            data_start = length_offset + 4
-
-                            if data_start + length <= len(pipl_data):
-                                prop_data = pipl_data[data_start:data_start + length]
-
-                                # Normalize type and data endianness for AEX
-                                corrected_type, corrected_data = self._normalize_aex_property(prop_type, prop_data)
-
-                                properties.append(PiplProperty(
-                                    property_type=corrected_type,
-                                    data=corrected_data,
-                                    length=len(corrected_data)
-                                ))
-
-                                print(f"Found property '{corrected_type}' length={len(corrected_data)} at offset=0x{offset:04x}")
-
-                                # Move to next property
-                                offset = data_start + length
-                                # Align to next MIB8
-                                while (offset < len(pipl_data) - 4 and
-                                       pipl_data[offset:offset+4] != b'MIB8'):
-                                    offset += 1
-                                continue
-
-                except Exception as e:
-                    print(f"Error parsing property at offset 0x{offset:04x}: {e}")
-
-            offset += 1
+
+        self._log_message(f"Analyzing {len(pipl_data)} bytes of PIPL data...")
+
+        # Jump from one MIB8 signature to the next
+        offset = _find_mib8(pipl_data)
+
+        while 0 <= offset < len(pipl_data) - 12:
+            try:
+                # Read property type (4 bytes after MIB8)
+                prop_type = bytes(pipl_data[offset+4:offset+8])
+
+                # Skip null padding (usually 4 bytes, at most 8)
+                padding = bytes(pipl_data[offset+8:offset+16])
+                length_offset = offset + 8 + len(padding) - len(padding.lstrip(b'\x00'))
+
+                # Read length (little-endian for Windows resources)
+                if length_offset + 4 <= len(pipl_data):
+                    length = _U32_LE.unpack_from(pipl_data, length_offset)[0]
+
+                    # Validate length
+                    if length > 0 and length < 10000:
+                        data_start = length_offset + 4
+
+                        if data_start + length <= len(pipl_data):
+                            prop_data = pipl_data[data_start:data_start + length]
+
+                            # Normalize type and data endianness for AEX
+                            corrected_type, corrected_data = self._normalize_aex_property(prop_type, prop_data)
+
+                            properties.append(PiplProperty(
+                                property_type=corrected_type,
+                                data=corrected_data,
+                                length=len(corrected_data)
+                            ))
+
+                            # Only build the per-record message when it will be kept
+                            if self.verbose:
+                                self._log_message(f"Found property '{corrected_type}' length={len(corrected_data)} at offset=0x{offset:04x}")
+
+                            # Move to the next property's MIB8
+                            offset = _find_mib8(pipl_data, data_start + length)
+                            continue
+
+            except Exception as e:
+                if self.verbose:
+                    self._log_message(f"Error parsing property at offset 0x{offset:04x}: {e}")
+
+            offset = _find_mib8(pipl_data, offset + 1)
 
         return properties
 
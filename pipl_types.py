@@ -5,6 +5,9 @@ from typing import Dict, Any, Optional
 import struct
 from enum import IntEnum
 
+_U32_BE = struct.Struct('>I')
+_HH_BE = struct.Struct('>HH')
+
 class Stage(IntEnum):
     """Version stage enumeration"""
     DEVELOP = 0
@@ -15,6 +18,9 @@ class Stage(IntEnum):
 @dataclass
 class VersionInfo:
     """Version information container"""
+    # Declared by hand since dataclass(slots=True) needs Python 3.10
+    __slots__ = ('version', 'subversion', 'bugversion', 'stage', 'build')
+
     version: int
     subversion: int
     bugversion: int
@@ -29,6 +35,8 @@ class VersionInfo:
 @dataclass
 class PiplProperty:
     """Represents a single PIPL property."""
+    __slots__ = ('property_type', 'data', 'length')
+
     property_type: str  # 4-character code like 'kind', 'name', etc.
     data: bytes
     length: int
@@ -54,6 +62,11 @@ PIPL_PROPERTY_TYPES = {
     b'aeFL': 'AE_Reserved_Info'
 }
 
+# Byte-reversed property type codes (as found in RCP/AEX resources) mapped to the canonical code
+PIPL_TYPE_ALIASES = {
+    code[::-1].decode('ascii'): code.decode('ascii') for code in PIPL_PROPERTY_TYPES
+}
+
 # Plugin kind constants
 PLUGIN_KINDS = {
     b'eFKT': 'AEEffect',
@@ -127,9 +140,15 @@ AE_OUT_FLAGS_2 = {
 def decode_flags(flags_value: int, flags_dict: Dict[int, str]) -> str:
     """Convert flags integer to readable flag names."""
     active_flags = []
-    for flag_bit, flag_name in flags_dict.items():
-        if flags_value & flag_bit:
+
+    # Visit only the set bits, lowest first (the flag tables are in ascending bit order)
+    remaining = flags_value & 0xFFFFFFFF
+    while remaining:
+        flag_bit = remaining & -remaining
+        flag_name = flags_dict.get(flag_bit)
+        if flag_name:
             active_flags.append(flag_name)
+        remaining ^= flag_bit
 
     if not active_flags:
         return "0"
@@ -141,7 +160,7 @@ def decode_flags(flags_value: int, flags_dict: Dict[int, str]) -> str:
 def decode_version(version_bytes: bytes) -> tuple:
     """Decode version bytes to major.minor format."""
     if len(version_bytes) >= 4:
-        major, minor = struct.unpack('>HH', version_bytes[:4])
+        major, minor = _HH_BE.unpack_from(version_bytes)
         return major, minor
     return 0, 0
 
@@ -151,56 +170,49 @@ def decode_string(data: bytes) -> str:
         return ""
 
     # Check for Pascal string format (length byte + string)
-    if len(data) > 0 and data[0] < len(data) and data[0] > 0:
-        length = data[0]
-        if length + 1 <= len(data):
-            return data[1:length+1].decode('utf-8', errors='ignore')
+    length = data[0]
+    if 0 < length < len(data):
+        return data[1:length+1].decode('utf-8', errors='ignore')
 
-    # Try as null-terminated string
-    null_pos = data.find(b'\x00')
-    if null_pos >= 0:
-        return data[:null_pos].decode('utf-8', errors='ignore')
-
-    # Try as plain string
-    return data.decode('utf-8', errors='ignore')
+    # Otherwise a null-terminated string, or a plain one if there is no terminator
+    return data.partition(b'\x00')[0].decode('utf-8', errors='ignore')
 
 def decode_entry_point(data: bytes) -> str:
     """Decode entry point string from code property."""
     return decode_string(data)
 
+# PF_VERS constants from After Effects SDK
+PF_VERS_BUILD_BITS = 0x1ff
+PF_VERS_BUILD_SHIFT = 0
+PF_VERS_STAGE_BITS = 0x3
+PF_VERS_STAGE_SHIFT = 9
+PF_VERS_BUGFIX_BITS = 0xf
+PF_VERS_BUGFIX_SHIFT = 11
+PF_VERS_SUBVERS_BITS = 0xf
+PF_VERS_SUBVERS_SHIFT = 15
+PF_VERS_VERS_BITS = 0x7
+PF_VERS_VERS_SHIFT = 19
+PF_VERS_VERS_HIGH_BITS = 0xf
+PF_VERS_VERS_HIGH_SHIFT = 26
+PF_VERS_VERS_LOW_SHIFT = 3
+
+# Stage field is 2 bits wide, so every value maps directly onto a Stage
+_STAGES = (Stage.DEVELOP, Stage.ALPHA, Stage.BETA, Stage.RELEASE)
+
 def extract_pf_version(encoded: int) -> VersionInfo:
     """Extract version information from encoded version value using AE format."""
-    # PF_VERS constants from After Effects SDK
-    PF_VERS_BUILD_BITS = 0x1ff
-    PF_VERS_BUILD_SHIFT = 0
-    PF_VERS_STAGE_BITS = 0x3
-    PF_VERS_STAGE_SHIFT = 9
-    PF_VERS_BUGFIX_BITS = 0xf
-    PF_VERS_BUGFIX_SHIFT = 11
-    PF_VERS_SUBVERS_BITS = 0xf
-    PF_VERS_SUBVERS_SHIFT = 15
-    PF_VERS_VERS_BITS = 0x7
-    PF_VERS_VERS_SHIFT = 19
-    PF_VERS_VERS_HIGH_BITS = 0xf
-    PF_VERS_VERS_HIGH_SHIFT = 26
-    PF_VERS_VERS_LOW_SHIFT = 3
-
-    build = (encoded >> PF_VERS_BUILD_SHIFT) & PF_VERS_BUILD_BITS
-    stage_num = (encoded >> PF_VERS_STAGE_SHIFT) & PF_VERS_STAGE_BITS
-    bugversion = (encoded >> PF_VERS_BUGFIX_SHIFT) & PF_VERS_BUGFIX_BITS
-    subversion = (encoded >> PF_VERS_SUBVERS_SHIFT) & PF_VERS_SUBVERS_BITS
-
-    version_low = (encoded >> PF_VERS_VERS_SHIFT) & PF_VERS_VERS_BITS
-    version_high = (encoded >> PF_VERS_VERS_HIGH_SHIFT) & PF_VERS_VERS_HIGH_BITS
-    version = (version_high << PF_VERS_VERS_LOW_SHIFT) | version_low
-
-    stage = Stage(stage_num) if stage_num in [0, 1, 2, 3] else Stage.DEVELOP
-
-    return VersionInfo(version, subversion, bugversion, stage, build)
+    return VersionInfo(
+        (((encoded >> PF_VERS_VERS_HIGH_SHIFT) & PF_VERS_VERS_HIGH_BITS) << PF_VERS_VERS_LOW_SHIFT)
+        | ((encoded >> PF_VERS_VERS_SHIFT) & PF_VERS_VERS_BITS),
+        (encoded >> PF_VERS_SUBVERS_SHIFT) & PF_VERS_SUBVERS_BITS,
+        (encoded >> PF_VERS_BUGFIX_SHIFT) & PF_VERS_BUGFIX_BITS,
+        _STAGES[(encoded >> PF_VERS_STAGE_SHIFT) & PF_VERS_STAGE_BITS],
+        (encoded >> PF_VERS_BUILD_SHIFT) & PF_VERS_BUILD_BITS
+    )
 
 def decode_effect_version(data: bytes) -> Optional[VersionInfo]:
     """Decode effect version from property data."""
     if len(data) >= 4:
-        encoded_version = struct.unpack('>I', data[:4])[0]
+        encoded_version = _U32_BE.unpack_from(data)[0]
         return extract_pf_version(encoded_version)
     return None
\ No newline at end of file
@@ -1,13 +1,131 @@
 """Generator for .r resource files from parsed PIPL properties."""
 
 import struct
-from typing import List, Dict
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from pipl_types import (
-    PiplProperty, PLUGIN_KINDS, AE_OUT_FLAGS, AE_OUT_FLAGS_2,
+    PiplProperty, VersionInfo, PLUGIN_KINDS, PIPL_TYPE_ALIASES, AE_OUT_FLAGS, AE_OUT_FLAGS_2,
     decode_flags, decode_version, decode_string, decode_entry_point,
-    decode_effect_version
+    extract_pf_version
 )
 
+_U32_BE = struct.Struct('>I')
+
+def _format_kind(data: bytes) -> str:
+    """Plugin kind."""
+    if len(data) >= 4:
+        return PLUGIN_KINDS.get(data[:4], "AEEffect")
+    return "AEEffect"  # Default
+
+def _format_version_pair(data: bytes) -> str:
+    """Major, minor version pair (ePVR/eSVR)."""
+    major, minor = decode_version(data)
+    return f"{major}, {minor}"
+
+def _format_effect_version(data: bytes) -> Optional[str]:
+    """Encoded effect version."""
+    if len(data) >= 4:
+        # Decode the value already read instead of unpacking it a second time;
+        # VersionInfo implements __str__ for human-readable output
+        version_raw = _U32_BE.unpack_from(data)[0]
+        return f"{version_raw:#x} // {extract_pf_version(version_raw)}"
+    return None
+
+def _format_info_flags(data: bytes) -> str:
+    """Effect info flags."""
+    if len(data) >= 4:
+        return str(_U32_BE.unpack_from(data)[0])
+    return "0"
+
+def _format_out_flags(data: bytes) -> str:
+    """Global out flags."""
+    if len(data) >= 4:
+        return decode_flags(_U32_BE.unpack_from(data)[0], AE_OUT_FLAGS)
+    return "<Error while parsing...>"
+
+def _format_out_flags_2(data: bytes) -> Optional[str]:
+    """Global out flags 2."""
+    if len(data) >= 4:
+        return decode_flags(_U32_BE.unpack_from(data)[0], AE_OUT_FLAGS_2)
+    return None
+
+def _format_reserved_info(data: bytes) -> str:
+    """Reserved info."""
+    if len(data) >= 4:
+        return str(_U32_BE.unpack_from(data)[0])
+    return "8"
+
+# Label and value formatter for each known (normalized) property type
+_PROPERTY_FORMATTERS: Dict[str, Tuple[str, Callable[[bytes], Optional[str]]]] = {
+    'kind': ('Kind', _format_kind),
+    'name': ('Name', decode_string),
+    'catg': ('Category', decode_string),
+    '8664': ('Entry Point (Windows 64)', decode_entry_point),
+    'mi64': ('Entry Point (Mac Intel 64)', decode_entry_point),
+    'ma64': ('Entry Point (Mac ARM 64)', decode_entry_point),
+    'ePVR': ('AE_PiPL_Version', _format_version_pair),
+    'eSVR': ('AE_Effect_Spec_Version', _format_version_pair),
+    'eVER': ('AE_Effect_Version', _format_effect_version),
+    'eINF': ('AE_Effect_Info_Flags', _format_info_flags),
+    'eGLO': ('AE_Effect_Global_OutFlags', _format_out_flags),
+    'eGL2': ('AE_Effect_Global_OutFlags_2', _format_out_flags_2),
+    'eMNA': ('AE_Effect_Match_Name', decode_string),
+    'aeFL': ('AE_Reserved_Info', _format_reserved_info)
+}
+
+# Generator attribute and decoder for the properties that describe the plugin itself
+_BASIC_INFO_FIELDS: Dict[str, Tuple[str, Callable[[bytes], str]]] = {
+    'name': ('plugin_name', decode_string),
+    'catg': ('category', decode_string),
+    'eMNA': ('unique_id', decode_string),
+    '8664': ('entry_point', decode_entry_point),
+    'mi64': ('entry_point', decode_entry_point),
+    'ma64': ('entry_point', decode_entry_point)
+}
+
+@dataclass
+class PluginSummary:
+    """Summary of the extracted plugin information."""
+    __slots__ = ('plugin_name', 'category', 'unique_id', 'entry_point', 'total_properties',
+                 'property_types', 'effect_version', 'effect_version_raw', 'pipl_version',
+                 'spec_version')
+
+    plugin_name: str
+    category: str
+    unique_id: str
+    entry_point: str
+    total_properties: int
+    property_types: Dict[str, int]
+    # None when the plugin has no such property
+    effect_version: Optional[str]
+    effect_version_raw: Optional[VersionInfo]
+    pipl_version: Optional[str]
+    spec_version: Optional[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the summary as a dict, leaving out the versions that are not present."""
+        summary = {
+            'plugin_name': self.plugin_name,
+            'category': self.category,
+            'unique_id': self.unique_id,
+            'entry_point': self.entry_point,
+            'total_properties': self.total_properties,
+            'property_types': self.property_types
+        }
+
+        if self.effect_version_raw is not None:
+            summary['effect_version'] = self.effect_version
+            summary['effect_version_raw'] = self.effect_version_raw
+
+        if self.pipl_version is not None:
+            summary['pipl_version'] = self.pipl_version
+
+        if self.spec_version is not None:
+            summary['spec_version'] = self.spec_version
+
+        return summary
+
 class RGenerator:
     """Generate .r resource files from PIPL properties."""
 
@@ -17,193 +135,94 @@ class RGenerator:
         self.category = "Utility"
         self.unique_id = "UNKN"
         self.entry_point = "EffectMain"
+        self._extracted = False
 
-    def _normalize_property_type(self, prop_type: str) -> str:
-        """Normalize property types from different sources (direct, reversed, Windows)."""
-        # Mapping for reversed property types (from RCP/AEX)
-        type_mappings = {
-            'dnik': 'kind',
-            'eman': 'name',
-            'gtac': 'catg',
-            '4668': '8664',
-            'ANMe': 'eMNA',
-            'RVPe': 'ePVR',
-            'RVSe': 'eSVR',
-            'REVe': 'eVER',
-            'FNIe': 'eINF',
-            'OLGe': 'eGLO',
-            '2LGe': 'eGL2',
-            'LFea': 'aeFL'
-        }
-
-        return type_mappings.get(prop_type, prop_type)
+    # Normalize property types from different sources (direct, reversed, Windows).
+    # Called as self._normalize(prop_type, prop_type); a builtin bound method is
+    # not a descriptor, so this is a plain dict.get with no extra frame
+    _normalize = PIPL_TYPE_ALIASES.get
 
     def _extract_basic_info(self) -> None:
-        """Extract basic plugin information from properties."""
+        """Extract basic plugin information from properties (only done once)."""
+        if self._extracted:
+            return
+
         for prop in self.properties:
-            normalized_type = self._normalize_property_type(prop.property_type)
-
-            if normalized_type == 'name':
-                self.plugin_name = decode_string(prop.data)
-            elif normalized_type == 'catg':
-                self.category = decode_string(prop.data)
-            elif normalized_type == 'eMNA':
-                self.unique_id = decode_string(prop.data)
-            elif normalized_type in ['8664', 'mi64', 'ma64']:
-                self.entry_point = decode_entry_point(prop.data)
-
-    def _generate_property(self, prop: PiplProperty, index: int) -> str:
+            field = _BASIC_INFO_FIELDS.get(self._normalize(prop.property_type, prop.property_type))
+            if field is not None:
+                attribute, decode = field
+                setattr(self, attribute, decode(prop.data))
+
+        self._extracted = True
+
+    def _generate_property(self, prop: PiplProperty, index: int) -> Optional[str]:
         """Generate a single property for the PIPL resource."""
-        comment = f"/* [{index}] */"
-        normalized_type = self._normalize_property_type(prop.property_type)
-
-        if normalized_type == 'kind':
-            # Plugin kind
-            value = "AEEffect"  # Default
-            if len(prop.data) >= 4:
-                kind_bytes = prop.data[:4]
-                if kind_bytes in PLUGIN_KINDS:
-                    value = PLUGIN_KINDS[kind_bytes]
-            return f"[{index}] Kind [{normalized_type}]: {value}"
-
-        elif normalized_type == 'name':
-            # Plugin name
-            value = decode_string(prop.data)
-            return f"[{index}] Name [{normalized_type}]: {value}"
-
-        elif normalized_type == 'catg':
-            # Category
-            value = decode_string(prop.data)
-            return f"[{index}] Category [{normalized_type}]: {value}"
-
-        elif normalized_type == '8664':
-            # Windows 64-bit code
-            value = decode_entry_point(prop.data)
-            return f"[{index}] Entry Point (Windows 64) [{normalized_type}]: {value}"
-
-        elif normalized_type == 'mi64':
-            # Mac Intel 64-bit code
-            value = decode_entry_point(prop.data)
-            return f"[{index}] Entry Point (Mac Intel 64) [{normalized_type}]: {value}"
-
-        elif normalized_type == 'ma64':
-            # Mac ARM 64-bit code
-            value = decode_entry_point(prop.data)
-            return f"[{index}] Entry Point (Mac ARM 64) [{normalized_type}]: {value}"
-
-        elif normalized_type == 'ePVR':
-            # AE PiPL Version
-            major, minor = decode_version(prop.data)
-            return f"[{index}] AE_PiPL_Version [{normalized_type}]: {major}, {minor}"
-
-        elif normalized_type == 'eSVR':
-            # AE Effect Spec Version
-            major, minor = decode_version(prop.data)
-            return f"[{index}] AE_Effect_Spec_Version [{normalized_type}]: {major}, {minor}"
-
-        elif normalized_type == 'eVER':
-            # Effect Version
-            if len(prop.data) >= 4:
-                version_raw = struct.unpack('>I', prop.data[:4])[0]
-                version_info = decode_effect_version(prop.data)
-                if version_info:
-                    # VersionInfo implements __str__ for human-readable output
-                    return f"[{index}] AE_Effect_Version [{normalized_type}]: {version_raw:#x} // {str(version_info)}"
-                return f"[{index}] AE_Effect_Version [{normalized_type}]: {version_raw:#x} // Unrecognized Version Value"
-
-        elif normalized_type == 'eINF':
-            # Effect Info Flags
-            if len(prop.data) >= 4:
-                flags = struct.unpack('>I', prop.data[:4])[0]
-            else:
-                flags = 0
-            return f"[{index}] AE_Effect_Info_Flags [{normalized_type}]: {flags}"
-
-        elif normalized_type == 'eGLO':
-            # Global Out Flags
-            if len(prop.data) >= 4:
-                flags_value = struct.unpack('>I', prop.data[:4])[0]
-                flags_str = decode_flags(flags_value, AE_OUT_FLAGS)
-                return f"[{index}] AE_Effect_Global_OutFlags [{normalized_type}]: {flags_str}"
-            else:
-                return f"[{index}] AE_Effect_Global_OutFlags [{normalized_type}]: <Error while parsing...>"
-
-        elif normalized_type == 'eGL2':
-            # Global Out Flags 2
-            if len(prop.data) >= 4:
-                flags_value = struct.unpack('>I', prop.data[:4])[0]
-                flags_str = decode_flags(flags_value, AE_OUT_FLAGS_2)
-                
-                return f"[{index}] AE_Effect_Global_OutFlags_2 [{normalized_type}]: {flags_str}"
-
-        elif normalized_type == 'eMNA':
-            # Match Name
-            match_name = decode_string(prop.data)
-            return f"[{index}] AE_Effect_Match_Name [{normalized_type}]: {match_name}"
-
-        elif normalized_type == 'aeFL':
-            # Reserved Info
-            if len(prop.data) >= 4:
-                reserved = struct.unpack('>I', prop.data[:4])[0]
-            else:
-                reserved = 8
-            return f"[{index}] AE_Reserved_Info [{normalized_type}]: {reserved}"
-
-        else:
+        normalized_type = self._normalize(prop.property_type, prop.property_type)
+        formatter = _PROPERTY_FORMATTERS.get(normalized_type)
+
+        if formatter is None:
             # Unknown property
             data_hex = prop.data[:16].hex() if prop.data else "00"
             return f"[{index}] Unknown [{normalized_type}]: {data_hex}..."
 
-    def print_info(self):
+        label, format_value = formatter
+        value = format_value(prop.data)
+        if value is None:
+            # Too short to decode (eVER/eGL2)
+            return None
+
+        return f"[{index}] {label} [{normalized_type}]: {value}"
+
+    def render(self) -> str:
+        """Return the generated property lines as one string."""
         self._extract_basic_info()
-        
+
         # Generate each property
-        for i, prop in enumerate(self.properties, 1):
-            print(self._generate_property(prop, i))
+        lines = [self._generate_property(prop, i) for i, prop in enumerate(self.properties, 1)]
 
-    def get_summary(self) -> Dict:
-        """Get a summary of the extracted plugin information."""
-        self._extract_basic_info()
+        # Properties too short to decode show up as "None", as they always have
+        return '\n'.join(map(str, lines))
 
+    def print_info(self):
+        if self.properties:
+            sys.stdout.write(self.render() + '\n')
+
+    def get_summary(self) -> PluginSummary:
+        """Get a summary of the extracted plugin information."""
         property_summary = {}
         version_info = None
         ae_pipl_version = None
         ae_spec_version = None
 
+        # Basic info, type counts and versions are all gathered in one pass
         for prop in self.properties:
-            if prop.property_type in property_summary:
-                property_summary[prop.property_type] += 1
-            else:
-                property_summary[prop.property_type] = 1
-
-            # Extract version information
-            normalized_type = self._normalize_property_type(prop.property_type)
-            if normalized_type == 'eVER':
+            property_summary[prop.property_type] = property_summary.get(prop.property_type, 0) + 1
+
+            normalized_type = self._normalize(prop.property_type, prop.property_type)
+            field = _BASIC_INFO_FIELDS.get(normalized_type)
+            if field is not None:
+                attribute, decode = field
+                setattr(self, attribute, decode(prop.data))
+            elif normalized_type == 'eVER':
                 if len(prop.data) >= 4:
-                    version_raw = struct.unpack('>I', prop.data[:4])[0]
-                    version_info = decode_effect_version(version_raw)
+                    version_raw = _U32_BE.unpack_from(prop.data)[0]
+                    version_info = extract_pf_version(version_raw)
             elif normalized_type == 'ePVR':
                 ae_pipl_version = decode_version(prop.data)
             elif normalized_type == 'eSVR':
                 ae_spec_version = decode_version(prop.data)
 
-        summary = {
-            'plugin_name': self.plugin_name,
-            'category': self.category,
-            'unique_id': self.unique_id,
-            'entry_point': self.entry_point,
-            'total_properties': len(self.properties),
-            'property_types': property_summary
-        }
-
-        if version_info:
-            summary['effect_version'] = str(version_info)
-            summary['effect_version_raw'] = version_info
-
-        if ae_pipl_version:
-            summary['pipl_version'] = f"{ae_pipl_version[0]}.{ae_pipl_version[1]}"
-
-        if ae_spec_version:
-            summary['spec_version'] = f"{ae_spec_version[0]}.{ae_spec_version[1]}"
-
-        return summary
\ No newline at end of file
+        self._extracted = True
+
+        return PluginSummary(
+            plugin_name=self.plugin_name,
+            category=self.category,
+            unique_id=self.unique_id,
+            entry_point=self.entry_point,
+            total_properties=len(self.properties),
+            property_types=property_summary,
+            effect_version=str(version_info) if version_info else None,
+            effect_version_raw=version_info,
+            pipl_version=f"{ae_pipl_version[0]}.{ae_pipl_version[1]}" if ae_pipl_version else None,
+            spec_version=f"{ae_spec_version[0]}.{ae_spec_version[1]}" if ae_spec_version else None
+        )
\ No newline at end of file
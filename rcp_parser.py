@@ -1,16 +1,60 @@
 """Parser for Windows resource compiler (.rcp) files containing PIPL data."""
 
+import codecs
 import re
 import struct
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from pipl_types import PiplProperty
 
+_PIPL_BLOCK_RE = re.compile(r'(\d+)\s+PiPL\s+DISCARDABLE\s*\n\s*BEGIN\s*\n(.*?)\nEND',
+                            re.DOTALL | re.MULTILINE)
+_RSCS32_RE = re.compile(r'RSCS32\(\s*(\d+)\s*\)')
+_HEX_ESCAPE_RE = re.compile(rb'\\x([0-9a-fA-F]{2})')
+
+# Input the unicode_escape codec would read differently from a plain \xNN/\0
+# pass: any other escape (\\, \n, \", a trailing backslash, ...), \0 followed
+# by an octal digit, and \x5C, whose backslash the plain pass reads again
+_NON_PLAIN_ESCAPE_RE = re.compile(rb'\\(?![x0])|\\0[0-7]|\\x5[cC]')
+
+_U32_BE = struct.Struct('>I')
+_HH_BE = struct.Struct('>HH')
+
+# Big-endian uint32 arrays, by value count, for the common data line lengths
+_UINT_STRUCTS = {n: struct.Struct('>' + 'I' * n) for n in range(1, 17)}
+
+def _read_line(text: str, start: int) -> Tuple[Optional[str], int]:
+    """Return the stripped line starting at `start` and the offset of the next line.
+
+    Past the last line the result is (None, start).
+    """
+    if start > len(text):
+        return None, start
+
+    stop = text.find('\n', start)
+    if stop < 0:
+        stop = len(text)
+
+    return text[start:stop].strip(), stop + 1
+
+def _data_field(line: str) -> str:
+    """Return a stripped line without its trailing comma, as stored in 'data_line'.
+
+    A second trailing comma (e.g. `"\\x04Test",,`) is dropped as well.
+    """
+    if line.endswith(','):
+        line = line[:-1].rstrip()
+    if line.endswith(','):
+        line = line[:-1]
+    return line
+
 class RcpParser:
     """Parse Windows .rcp resource compiler files to extract PIPL data."""
 
     def __init__(self, file_path: str):
         self.file_path = file_path
         self.content = ''
+        self._pipl_pos = None
+        self._pipl_block = None
         self._load_file()
 
     def _load_file(self) -> None:
@@ -25,13 +69,22 @@ class RcpParser:
 
     def _parse_string_literal(self, text: str) -> bytes:
         """Parse a string literal with escape sequences."""
-        # Handle hex escapes like \x12
-        text = re.sub(r'\\x([0-9a-fA-F]{2})', lambda m: chr(int(m.group(1), 16)), text)
-
-        # Handle null terminators
-        text = text.replace('\\0', '\x00')
-
-        return text.encode('utf-8', errors='ignore')
+        raw = text.encode('utf-8', errors='ignore')
+        if b'\\' not in raw:
+            return raw
+
+        # Decode hex escapes like \x12 and null terminators in one C-level pass;
+        # latin-1 maps each decoded code point back to the byte it came from
+        if not _NON_PLAIN_ESCAPE_RE.search(raw):
+            try:
+                return codecs.decode(raw, 'unicode_escape').encode('latin-1')
+            except UnicodeDecodeError:
+                # e.g. \x without two hex digits, which stays literal below
+                pass
+
+        # Handle hex escapes like \x12, then null terminators; nothing else is an escape
+        raw = _HEX_ESCAPE_RE.sub(lambda m: bytes((int(m.group(1), 16),)), raw)
+        return raw.replace(b'\\0', b'\x00')
 
     def _parse_long_value(self, text: str) -> int:
         """Parse long integer values from RCP format."""
@@ -45,111 +98,112 @@ class RcpParser:
         else:
             return int(text)
 
+    def _find_pipl_marker(self) -> int:
+        """Return the offset of the first 'PiPL' in the content, or -1 (result is cached)."""
+        if self._pipl_pos is None:
+            self._pipl_pos = self.content.find('PiPL')
+        return self._pipl_pos
+
     def _extract_pipl_block(self) -> Optional[str]:
-        """Extract the PIPL resource block from RCP content."""
-        # Find the PiPL resource definition
-        pipl_pattern = r'(\d+)\s+PiPL\s+DISCARDABLE\s*\n\s*BEGIN\s*\n(.*?)\nEND'
-        match = re.search(pipl_pattern, self.content, re.DOTALL | re.MULTILINE)
+        """Extract the PIPL resource block from RCP content (result is cached)."""
+        if self._pipl_block is None:
+            self._pipl_block = self._locate_pipl_block()
+        # An empty string marks a file without a PiPL block
+        return self._pipl_block or None
+
+    def _locate_pipl_block(self) -> str:
+        """Locate the PIPL resource block in RCP content."""
+        pipl_pos = self._find_pipl_marker()
+        if pipl_pos < 0:
+            return ''
+
+        # Find the PiPL resource definition. The resource ID and the whitespace
+        # before the first marker (newlines included) belong to the match, so
+        # back up over them before searching
+        start = pipl_pos
+        while start > 0 and (self.content[start - 1].isspace() or self.content[start - 1].isdigit()):
+            start -= 1
+        match = _PIPL_BLOCK_RE.search(self.content, start)
 
         if match:
             resource_id, pipl_content = match.groups()
             return pipl_content.strip()
 
-        return None
+        return ''
 
     def _parse_pipl_properties(self, pipl_content: str) -> List[Dict]:
         """Parse individual properties from PIPL block content."""
         properties = []
-        lines = [line.strip() for line in pipl_content.split('\n')]
 
-        i = 0
-        while i < len(lines):
-            line = lines[i]
+        # `line` is the current (stripped) line and `pos` the offset of the next one
+        pos = 0
+        while True:
+            # Jump straight to the next line holding a "MIB8" signature
+            hit = pipl_content.find('"MIB8",', pos)
+            if hit < 0:
+                break
 
-            # Skip comments, empty lines, and initial bytes
-            if (line.startswith('/*') or line.startswith('//') or not line.strip() or
-                line.startswith('0x0001') or 'kCurrentPiPLVersion' in line or 'Property Count' in line):
-                i += 1
+            line, pos = _read_line(pipl_content, pipl_content.rfind('\n', 0, hit) + 1)
+            if line != '"MIB8",':
                 continue
 
-            # Look for property signatures like "MIB8"
-            if line.strip() == '"MIB8",':
-                # This starts a new property
-                if i + 1 < len(lines):
-                    i += 1
-                    type_line = lines[i].strip()
-
-                    # Extract property type
-                    if type_line.startswith('"') and (',' in type_line or type_line.endswith('"')):
-                        # Remove quotes and comma - DON'T reverse yet
-                        if type_line.endswith(','):
-                            prop_type_raw = type_line[1:-2]
-                        else:
-                            prop_type_raw = type_line[1:-1]
-
-                        # Keep the original property type (will be mapped later)
-                        prop_type = prop_type_raw
-
-                        # Skip RSCS32(0) lines
-                        i += 1
-                        while i < len(lines) and 'RSCS32(0)' in lines[i]:
-                            i += 1
-
-                        # Look for length specification
-                        if i < len(lines) and 'RSCS32(' in lines[i]:
-                            length_match = re.search(r'RSCS32\(\s*(\d+)\s*\)', lines[i])
-                            if length_match:
-                                length = int(length_match.group(1))
-                                i += 1
-
-                                # Extract property data from the next line(s)
-                                if i < len(lines):
-                                    data_line = lines[i].strip()
-                                    if data_line.endswith(','):
-                                        data_line = data_line[:-1]
-
-                                    properties.append({
-                                        'signature': 'MIB8',
-                                        'type': prop_type,
-                                        'length': length,
-                                        'data_line': data_line
-                                    })
-
-                    elif type_line.startswith('0x') and 'L' in type_line:
-                        # Handle hex property types like 0x65564552L
-                        hex_value = self._parse_long_value(type_line.split(',')[0])
-                        try:
-                            prop_type = struct.pack('>I', hex_value).decode('ascii', errors='ignore')
-                        except:
-                            prop_type = f'0x{hex_value:08x}'
-
-                        # Look for following lines
-                        i += 1
-                        if i < len(lines) and lines[i].strip() == '0L,':
-                            i += 1
-                        if i < len(lines) and lines[i].strip().endswith('L'):
-                            length_line = lines[i].strip()
-                            if length_line.endswith(','):
-                                length_line = length_line[:-1]
-                            if length_line.endswith('L'):
-                                length_line = length_line[:-1]
-                            try:
-                                length = int(length_line)
-                            except:
-                                length = 4
-                            i += 1
-                            if i < len(lines):
-                                data_line = lines[i].strip()
-                                if data_line.endswith(','):
-                                    data_line = data_line[:-1]
-                                properties.append({
-                                    'signature': 'MIB8',
-                                    'type': prop_type,
-                                    'length': length,
-                                    'data_line': data_line
-                                })
-
-            i += 1
+            # This starts a new property
+            line, pos = _read_line(pipl_content, pos)
+            if line is None:
+                break
+
+            # Extract property type
+            if line.startswith('"') and (',' in line or line.endswith('"')):
+                # Remove quotes and comma - DON'T reverse yet (will be mapped later)
+                prop_type = line[1:-2] if line.endswith(',') else line[1:-1]
+
+                # Skip RSCS32(0) lines
+                line, pos = _read_line(pipl_content, pos)
+                while line is not None and 'RSCS32(0)' in line:
+                    line, pos = _read_line(pipl_content, pos)
+
+                # Look for length specification
+                if line is not None and 'RSCS32(' in line:
+                    length_match = _RSCS32_RE.search(line)
+                    if length_match:
+                        length = int(length_match.group(1))
+
+                        # Extract property data from the next line
+                        line, pos = _read_line(pipl_content, pos)
+                        if line is not None:
+                            properties.append({
+                                'signature': 'MIB8',
+                                'type': prop_type,
+                                'length': length,
+                                'data_line': _data_field(line)
+                            })
+
+            elif line.startswith('0x') and 'L' in line:
+                # Handle hex property types like 0x65564552L
+                hex_value = self._parse_long_value(line.split(',')[0])
+                try:
+                    prop_type = _U32_BE.pack(hex_value).decode('ascii', errors='ignore')
+                except:
+                    prop_type = f'0x{hex_value:08x}'
+
+                # Look for following lines
+                line, pos = _read_line(pipl_content, pos)
+                if line == '0L,':
+                    line, pos = _read_line(pipl_content, pos)
+                if line is not None and line.endswith('L'):
+                    try:
+                        length = int(line[:-1])
+                    except ValueError:
+                        length = 4
+
+                    line, pos = _read_line(pipl_content, pos)
+                    if line is not None:
+                        properties.append({
+                            'signature': 'MIB8',
+                            'type': prop_type,
+                            'length': length,
+                            'data_line': _data_field(line)
+                        })
 
         return properties
 
@@ -168,10 +222,8 @@ class RcpParser:
             if len(prop_type) > 4:
                 prop_type = prop_type[:4]
 
-            # Parse property data
-            data_line = prop['data_line'].strip()
-            if data_line.endswith(','):
-                data_line = data_line[:-1]
+            # Parse property data (already stripped, without its trailing comma)
+            data_line = prop['data_line']
 
             # Handle different data formats
             if data_line.startswith('"') and data_line.endswith('"'):
@@ -180,23 +232,30 @@ class RcpParser:
                 data = self._parse_string_literal(string_content)
             elif ',' in data_line and not data_line.startswith('"'):
                 # Multiple numeric values
-                values = [self._parse_long_value(v.strip()) for v in data_line.split(',') if v.strip()]
+                fields = [v.strip() for v in data_line.split(',')]
+                try:
+                    # int(v, 0) reads both decimal and 0x hex in one call
+                    values = [int(v[:-1] if v.endswith('L') else v, 0) for v in fields if v]
+                except ValueError:
+                    # e.g. decimals with leading zeros, which base 0 rejects
+                    values = [self._parse_long_value(v) for v in fields if v]
                 if len(values) == 1:
-                    data = struct.pack('>I', values[0])
+                    data = _U32_BE.pack(values[0])
                 elif len(values) == 2:
-                    data = struct.pack('>HH', values[0], values[1])
+                    data = _HH_BE.pack(values[0], values[1])
                 else:
-                    # Pack as array of 32-bit values
-                    data = b''.join(struct.pack('>I', v) for v in values)
+                    # Pack as array of 32-bit values in a single call
+                    uint_struct = _UINT_STRUCTS.get(len(values)) or struct.Struct('>' + 'I' * len(values))
+                    data = uint_struct.pack(*values)
             elif data_line.endswith('L'):
                 # Single long value
                 value = self._parse_long_value(data_line)
-                data = struct.pack('>I', value)
+                data = _U32_BE.pack(value)
             else:
                 # Try to parse as integer
                 try:
                     value = int(data_line)
-                    data = struct.pack('>I', value)
+                    data = _U32_BE.pack(value)
                 except ValueError:
                     # Fallback to raw string
                     data = data_line.encode('utf-8', errors='ignore')
@@ -211,13 +270,14 @@ class RcpParser:
 
     def get_file_info(self) -> Dict:
         """Get basic information about the RCP file."""
-        has_pipl = 'PiPL' in self.content
+        pipl_pos = self._find_pipl_marker()
         pipl_content = self._extract_pipl_block()
 
         return {
             'file_path': self.file_path,
             'file_size': len(self.content),
-            'has_pipl_block': has_pipl,
+            'has_pipl_block': pipl_pos >= 0,
             'pipl_content_length': len(pipl_content) if pipl_content else 0,
-            'num_mib8_signatures': self.content.count('"MIB8"')
+            # MIB8 records only follow the PiPL marker
+            'num_mib8_signatures': self.content.count('"MIB8"', pipl_pos) if pipl_pos >= 0 else 0
         }
\ No newline at end of file
@@ -1,79 +1,90 @@
 """Parser for macOS resource fork (.rsrc) files containing PIPL data."""
 
+import mmap
 import struct
 from typing import List, Dict, Optional, Tuple, Any
 from pipl_types import PiplProperty, PIPL_PROPERTY_TYPES
 
+_U32_BE = struct.Struct('>I')
+
+# Byte-to-character table for the ASCII column of debug_hex_dump
+_PRINTABLE_TABLE = bytes(c if 32 <= c < 127 else 0x2E for c in range(256))
+
 class ResourceForkParser:
     """Parse macOS resource fork files to extract PIPL data."""
 
     def __init__(self, file_path: str):
         self.file_path = file_path
         self.data = b''
+        self._mmap = None
         self._load_file()
 
     def _load_file(self) -> None:
-        """Load the entire resource file into memory."""
+        """Map the resource file into memory (read-only)."""
         try:
             with open(self.file_path, 'rb') as f:
-                self.data = f.read()
+                # mmap cannot map an empty file, keep b'' in that case
+                if f.seek(0, 2) > 0:
+                    self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    self.data = self._mmap
         except FileNotFoundError:
             raise FileNotFoundError(f"Resource file not found: {self.file_path}")
         except Exception as e:
             raise Exception(f"Error loading resource file: {e}")
 
-    def _read_big_endian_uint32(self, offset: int) -> int:
-        """Read a big-endian 32-bit unsigned integer."""
-        if offset + 4 > len(self.data):
-            raise ValueError(f"Cannot read uint32 at offset {offset}")
-        return struct.unpack('>I', self.data[offset:offset+4])[0]
+    def close(self) -> None:
+        """Release the memory mapping of the resource file."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+            self.data = b''
+
+    def __enter__(self):
+        return self
 
-    def _read_big_endian_uint16(self, offset: int) -> int:
-        """Read a big-endian 16-bit unsigned integer."""
-        if offset + 2 > len(self.data):
-            raise ValueError(f"Cannot read uint16 at offset {offset}")
-        return struct.unpack('>H', self.data[offset:offset+2])[0]
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+    def _count(self, needle: bytes) -> int:
+        """Count non-overlapping occurrences of `needle` (mmap has no count())."""
+        count = 0
+        pos = self.data.find(needle)
+        while pos >= 0:
+            count += 1
+            pos = self.data.find(needle, pos + len(needle))
+        return count
 
     def _find_pipl_in_binary(self) -> List[Dict]:
         """Find PIPL data in binary by looking for 8BIM signatures."""
         pipl_data_blocks = []
-        offset = 0
-
-        while offset < len(self.data) - 12:
-            # Look for '8BIM' signature
-            if self.data[offset:offset+4] == b'8BIM':
-                # Found potential PIPL property
-                try:
-                    property_type = self.data[offset+4:offset+8]
-
-                    # Skip 4 null bytes (standard in this format)
-                    null_bytes_offset = offset + 8
-                    if null_bytes_offset + 4 <= len(self.data):
-                        # Read length at offset + 12
-                        length_offset = null_bytes_offset + 4
-                        if length_offset + 4 <= len(self.data):
-                            length = self._read_big_endian_uint32(length_offset)
-                            data_start = length_offset + 4
-
-                            if data_start + length <= len(self.data):
-                                property_data = self.data[data_start:data_start + length]
-                                pipl_data_blocks.append({
-                                    'type': property_type,
-                                    'length': length,
-                                    'data': property_data
-                                })
-                                # Move to next property (align to next 8BIM)
-                                offset = data_start + length
-                            else:
-                                offset += 1
-                        else:
-                            offset += 1
-                    else:
-                        offset += 1
-                except Exception as e:
-                    offset += 1
-            else:
-                offset += 1
+        data = self.data
+        data_len = len(data)
+
+        # Jump from one '8BIM' signature to the next
+        offset = data.find(b'8BIM')
+
+        while 0 <= offset < data_len - 12:
+            # Found potential PIPL property: type, 4 null bytes, length at offset + 12
+            length_offset = offset + 12
+            if length_offset + 4 <= data_len:
+                # Bounds are checked above, so read the length directly
+                length = _U32_BE.unpack_from(data, length_offset)[0]
+                data_start = length_offset + 4
+
+                if data_start + length <= data_len:
+                    pipl_data_blocks.append({
+                        'type': data[offset+4:offset+8],
+                        'length': length,
+                        'data': data[data_start:data_start + length]
+                    })
+                    # Move to next property (the next 8BIM after its data)
+                    offset = data.find(b'8BIM', data_start + length)
+                    continue
+
+            offset = data.find(b'8BIM', offset + 1)
 
         return pipl_data_blocks
 
@@ -85,12 +96,10 @@ class ResourceForkParser:
         pipl_blocks = self._find_pipl_in_binary()
 
         for block in pipl_blocks:
-            prop_type = block['type'].decode('ascii', errors='ignore')
-
-            # Map property type codes
+            # Map property type codes, decoding only the known ones
             if block['type'] in PIPL_PROPERTY_TYPES:
                 properties.append(PiplProperty(
-                    property_type=prop_type,
+                    property_type=block['type'].decode('ascii'),
                     data=block['data'],
                     length=block['length']
                 ))
@@ -110,16 +119,18 @@ class ResourceForkParser:
             # Return data starting from PIPL marker
             return self.data[pipl_pos:]
 
-        return self.data
+        # Slicing copies the mapped file into bytes
+        return self.data[:]
 
     def get_file_info(self) -> Dict:
         """Get basic information about the resource file."""
         return {
             'file_path': self.file_path,
             'file_size': len(self.data),
-            'has_pipl_marker': b'PiPL' in self.data,
-            'has_8bim_signatures': b'8BIM' in self.data,
-            'num_8bim_blocks': self.data.count(b'8BIM')
+            # `in` on an mmap only tests single bytes, so search with find()
+            'has_pipl_marker': self.data.find(b'PiPL') >= 0,
+            'has_8bim_signatures': self.data.find(b'8BIM') >= 0,
+            'num_8bim_blocks': self._count(b'8BIM')
         }
 
     def debug_hex_dump(self, start: int = 0, length: int = 256) -> str:
@@ -128,8 +139,9 @@ class ResourceForkParser:
         result = []
 
         for i in range(start, end, 16):
-            hex_part = ' '.join(f'{b:02x}' for b in self.data[i:i+16])
-            ascii_part = ''.join(chr(b) if 32 <= b < 127 else '.' for b in self.data[i:i+16])
+            row = self.data[i:i+16]
+            hex_part = row.hex(' ')
+            ascii_part = row.translate(_PRINTABLE_TABLE).decode('ascii')
             result.append(f'{i:08x}  {hex_part:<48} |{ascii_part}|')
 
         return '\n'.join(result)
\ No newline at end of file